@@ -0,0 +1,105 @@
+"""Chat latency against a local stub of the file API.
+
+Starts a threaded HTTP stub that answers like a server without the
+account-wide /api/images endpoint (so the chatbot fans out one request per
+folder), adds a fixed delay to every response to stand in for network round
+trips, and times process_message() with and without the pooled, concurrent
+client and the response cache.
+
+    python benchmarks/chatbot_latency.py --folders 200 --latency 0.02
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import chatbot  # noqa: E402
+
+
+def make_stub(folders, latency):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive, as a real server would offer
+        disable_nagle_algorithm = True  # Headers and body go out in separate writes
+
+        def do_GET(self):
+            time.sleep(latency)
+            path = self.path.split('?', 1)[0]
+            match = re.fullmatch(r'/api/folder/(\d+)/images', path)
+            if path == '/api/folders':
+                body = {'status': 'success', 'data': [
+                    {'id': i, 'name': f'folder {i}', 'file_count': 3} for i in range(1, folders + 1)
+                ]}
+            elif match:
+                folder_id = int(match.group(1))
+                body = {'status': 'success', 'data': [
+                    {'id': folder_id * 10 + n, 'filename': f'{folder_id}-{n}.png', 'description': '',
+                     'uploaded_at': '2024-01-01T00:00:00'} for n in range(3)
+                ]}
+            else:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+
+
+def time_turns(message, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = chatbot.process_message(message, 'bench-key')
+        timings.append(time.perf_counter() - start)
+    return result, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--folders', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds added to every stub response')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--message', default='show all images')
+    args = parser.parse_args()
+
+    server = make_stub(args.folders, args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    chatbot.BASE_URL = f'http://127.0.0.1:{server.server_address[1]}'
+
+    fresh_seconds = chatbot.CACHE_FRESH_SECONDS
+    configurations = [
+        ('sequential, no session', requests, ThreadPoolExecutor(max_workers=1), 0),
+        ('pooled session, sequential', chatbot.create_http_session(), ThreadPoolExecutor(max_workers=1), 0),
+        (f'pooled session, {chatbot.FANOUT_WORKERS} workers', chatbot.http, chatbot.fanout, 0),
+        ('... plus response cache', chatbot.http, chatbot.fanout, fresh_seconds),
+    ]
+    print(f'{args.folders} folders, {args.latency * 1000:.0f}ms per response, {args.runs} runs of {args.message!r}\n')
+    print(f"{'client':<32}{'median':>10}{'max':>10}")
+    for name, http, fanout, fresh in configurations:
+        chatbot.http, chatbot.fanout, chatbot.CACHE_FRESH_SECONDS = http, fanout, fresh
+        result, timings = time_turns(args.message, args.runs)
+        print(f'{name:<32}{statistics.median(timings) * 1000:>8.0f}ms{max(timings) * 1000:>8.0f}ms'
+              f"   ({len(result.get('data', []))} images)")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Intent dispatch cost: the compiled router against a chain of any()/re.search.
+
+Times how long it takes to pick the first matching intent (and its slot) for
+a set of chat messages, using chatbot.INTENTS as-is and again with extra
+synthetic intents appended, to show how each approach scales as intents are
+added. No API calls are made.
+
+    python benchmarks/intent_router.py --extra 200 --runs 2000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import chatbot  # noqa: E402
+
+MESSAGES = [
+    'hello there',
+    'show all images',
+    'show me the holiday folder',
+    'images with description sunset over the sea',
+    'file called invoice',
+    'find cats on the sofa',
+    'how many pdfs do i have',
+    'what can you do',
+    'weather tomorrow please',
+]
+
+
+def synthetic_intents(count):
+    return [(f'extra{n}', [f'keyword{n}', f'phrase {n} here'], [rf'about{n} (.*)']) for n in range(count)]
+
+
+def linear_dispatch(intents, message):
+    """The old approach: test each intent's phrases, then its patterns, in order"""
+    for name, triggers, patterns in intents:
+        if not any(phrase in message for phrase in triggers):
+            continue
+        if patterns is None:
+            return name, None
+        for pattern in patterns:
+            match = re.search(pattern, message)
+            if match:
+                return name, match.group(1)
+    return None, None
+
+
+def router_dispatch(router, message):
+    return next(router.candidates(message), (None, None))
+
+
+def time_per_message(dispatch, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        for message in MESSAGES:
+            dispatch(message)
+    return (time.perf_counter() - start) / (runs * len(MESSAGES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--extra', type=int, default=200, help='synthetic intents appended to the real ones')
+    parser.add_argument('--runs', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f'{len(MESSAGES)} messages, {args.runs} runs\n')
+    print(f"{'intents':<10}{'any()/re.search':>18}{'router':>12}")
+    for intents in (chatbot.INTENTS, chatbot.INTENTS + synthetic_intents(args.extra)):
+        router = chatbot.IntentRouter(intents)
+        for message in MESSAGES:
+            assert router_dispatch(router, message) == linear_dispatch(intents, message), message
+        linear = time_per_message(lambda message: linear_dispatch(intents, message), args.runs)
+        compiled = time_per_message(lambda message: router_dispatch(router, message), args.runs)
+        print(f'{len(intents):<10}{linear * 1e6:>16.1f}us{compiled * 1e6:>10.1f}us')
+
+
+if __name__ == '__main__':
+    main()
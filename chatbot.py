@@ -1,5 +1,13 @@
 from flask import Flask, render_template, request, jsonify, session
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
+import hashlib
+import json
+import threading
+import time
 import os
 from datetime import datetime
 import re
@@ -7,15 +15,113 @@ import re
 app = Flask(__name__)
 app.secret_key = os.urandom(24)  # For session management
 
-BASE_URL = "https://imageapi.pythonanywhere.com"
+BASE_URL = os.environ.get('FILEBOT_API_URL', "https://imageapi.pythonanywhere.com")
+REQUEST_TIMEOUT = (3.05, 15)  # (connect, read) seconds
+FANOUT_WORKERS = int(os.environ.get('FANOUT_WORKERS', 8))  # Concurrent requests when fetching per folder
+CACHE_FRESH_SECONDS = float(os.environ.get('CHATBOT_CACHE_TTL', 10))  # Reuse without asking the API
+CACHE_MAX_AGE_SECONDS = 600  # After this an entry is dropped rather than revalidated
+CACHE_MAX_ENTRIES = 1024
+CACHEABLE_STATUSES = (200, 404)  # 404 covers endpoints an older API does not have
+
+def create_http_session():
+    """Keep-alive session sized for the fan-out, retrying idempotent requests on transient errors"""
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504], allowed_methods=['GET', 'HEAD'])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=FANOUT_WORKERS, max_retries=retry)
+    http_session = requests.Session()
+    http_session.mount('http://', adapter)
+    http_session.mount('https://', adapter)
+    return http_session
+
+http = create_http_session()
+fanout = ThreadPoolExecutor(max_workers=FANOUT_WORKERS)
+
+def api_get(path, api_key, params=None, headers=None):
+    """GET an API path over the shared session"""
+    return http.get(f"{BASE_URL}{path}", params=params, headers={"X-API-Key": api_key, **(headers or {})},
+                    timeout=REQUEST_TIMEOUT)
+
+class ApiCache:
+    """Per-API-key cache of GET responses, shared by every chat turn.
+
+    Entries are reused for CACHE_FRESH_SECONDS, then revalidated with
+    If-None-Match so an unchanged collection costs a bodyless 304. Concurrent
+    requests for the same URL wait for a single fetch, and the least recently
+    used entries are evicted beyond CACHE_MAX_ENTRIES. Bodies are stored as
+    bytes and parsed per call, so callers can modify what they get back.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> [fetched_at, validated_at, status, etag, content]
+        self._inflight = {}  # key -> threading.Event
+        self._lock = threading.Lock()
+
+    def get(self, path, api_key, params=None):
+        """``(status_code, parsed body or None)`` for a GET"""
+        key = (hashlib.sha256(api_key.encode()).hexdigest(), path, tuple(sorted((params or {}).items())))
+        waited_since = None
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                now = time.monotonic()
+                if entry and now - entry[0] > CACHE_MAX_AGE_SECONDS:
+                    del self._entries[key]
+                    entry = None
+                if entry and (now - entry[1] < CACHE_FRESH_SECONDS or (waited_since and entry[1] >= waited_since)):
+                    self._entries.move_to_end(key)
+                    return entry[2], json.loads(entry[4]) if entry[4] else None
+                pending = self._inflight.get(key)
+                if pending is None:
+                    self._inflight[key] = threading.Event()
+                    break
+            waited_since = now
+            pending.wait()  # Another turn is fetching this URL; use its result
+
+        try:
+            return self._fetch(key, entry, path, api_key, params)
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def _fetch(self, key, entry, path, api_key, params):
+        headers = {'If-None-Match': entry[3]} if entry and entry[3] else None
+        response = api_get(path, api_key, params, headers)
+        now = time.monotonic()
+        with self._lock:
+            if response.status_code == 304 and entry:
+                entry[1] = now
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                return entry[2], json.loads(entry[4]) if entry[4] else None
+            if response.status_code in CACHEABLE_STATUSES:
+                self._entries[key] = [now, now, response.status_code, response.headers.get('ETag'), response.content]
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.pop(key, None)
+        return response.status_code, response.json() if response.content else None
+
+api_cache = ApiCache(CACHE_MAX_ENTRIES)
+
+def fetch_all_pages(path, api_key, params=None):
+    """GET a list endpoint, following pagination cursors until the last page"""
+    params = dict(params or {})
+    items = []
+    while True:
+        status, body = api_cache.get(path, api_key, params)
+        if status != 200:
+            return items if items else None
+        items.extend(body.get('data', []))
+        cursor = (body.get('pagination') or {}).get('next_cursor')
+        if not cursor:
+            return items
+        params['cursor'] = cursor
 
 def get_all_folders(api_key):
     """Fetch all folders"""
     try:
-        response = requests.get(f"{BASE_URL}/api/folders", headers={"X-API-Key": api_key})
-        if response.status_code == 200:
-            return response.json().get('data', [])
-        return []
+        return fetch_all_pages("/api/folders", api_key) or []
     except Exception as e:
         print(f"Error fetching folders: {e}")
         return []
@@ -31,10 +137,21 @@ def get_folder_by_name(folder_name, api_key):
 def get_folder_by_id(folder_id, api_key):
     """Get specific folder details"""
     try:
-        response = requests.get(f"{BASE_URL}/api/folder/{folder_id}", headers={"X-API-Key": api_key})
-        if response.status_code == 200:
-            return response.json().get('data', None)
-        return None
+        params = {}
+        folder = None
+        while True:
+            status, body = api_cache.get(f"/api/folder/{folder_id}", api_key, params)
+            if status != 200:
+                return folder
+            page = body.get('data') or {}
+            if folder is None:
+                folder = page
+            else:
+                folder['files'].extend(page.get('files', []))
+            cursor = (body.get('pagination') or {}).get('next_cursor')
+            if not cursor:
+                return folder
+            params['cursor'] = cursor
     except Exception as e:
         print(f"Error fetching folder: {e}")
         return None
@@ -42,12 +159,15 @@ def get_folder_by_id(folder_id, api_key):
 def get_all_images(api_key):
     """Fetch all images from all folders"""
     try:
+        images = fetch_all_pages("/api/images", api_key)
+        if images is not None:
+            return images
+        # Older servers have no account-wide listing; fall back to one request per folder
         folders = get_all_folders(api_key)
         all_images = []
-        for folder in folders:
-            images_response = requests.get(f"{BASE_URL}/api/folder/{folder['id']}/images", headers={"X-API-Key": api_key})
-            if images_response.status_code == 200:
-                images = images_response.json().get('data', [])
+        pages = fanout.map(lambda folder: fetch_all_pages(f"/api/folder/{folder['id']}/images", api_key), folders)
+        for folder, images in zip(folders, pages):
+            if images is not None:
                 for img in images:
                     img['folder_name'] = folder['name']
                     img['folder_id'] = folder['id']
@@ -60,10 +180,7 @@ def get_all_images(api_key):
 def get_images_from_folder(folder_id, api_key):
     """Get images from specific folder"""
     try:
-        response = requests.get(f"{BASE_URL}/api/folder/{folder_id}/images", headers={"X-API-Key": api_key})
-        if response.status_code == 200:
-            return response.json().get('data', [])
-        return []
+        return fetch_all_pages(f"/api/folder/{folder_id}/images", api_key) or []
     except Exception as e:
         print(f"Error fetching images: {e}")
         return []
@@ -71,12 +188,15 @@ def get_images_from_folder(folder_id, api_key):
 def get_all_pdfs(api_key):
     """Fetch all PDFs from all folders"""
     try:
+        pdfs = fetch_all_pages("/api/pdfs", api_key)
+        if pdfs is not None:
+            return pdfs
+        # Older servers have no account-wide listing; fall back to one request per folder
         folders = get_all_folders(api_key)
         all_pdfs = []
-        for folder in folders:
-            pdfs_response = requests.get(f"{BASE_URL}/api/folder/{folder['id']}/pdfs", headers={"X-API-Key": api_key})
-            if pdfs_response.status_code == 200:
-                pdfs = pdfs_response.json().get('data', [])
+        pages = fanout.map(lambda folder: fetch_all_pages(f"/api/folder/{folder['id']}/pdfs", api_key), folders)
+        for folder, pdfs in zip(folders, pages):
+            if pdfs is not None:
                 for pdf in pdfs:
                     pdf['folder_name'] = folder['name']
                     pdf['folder_id'] = folder['id']
@@ -89,10 +209,7 @@ def get_all_pdfs(api_key):
 def get_pdfs_from_folder(folder_id, api_key):
     """Get PDFs from specific folder"""
     try:
-        response = requests.get(f"{BASE_URL}/api/folder/{folder_id}/pdfs", headers={"X-API-Key": api_key})
-        if response.status_code == 200:
-            return response.json().get('data', [])
-        return []
+        return fetch_all_pages(f"/api/folder/{folder_id}/pdfs", api_key) or []
     except Exception as e:
         print(f"Error fetching PDFs: {e}")
         return []
@@ -100,9 +217,9 @@ def get_pdfs_from_folder(folder_id, api_key):
 def search_images(query, api_key):
     """Search images by name or description"""
     try:
-        response = requests.get(f"{BASE_URL}/api/search", params={"q": query}, headers={"X-API-Key": api_key})
-        if response.status_code == 200:
-            return response.json().get('data', [])
+        status, body = api_cache.get("/api/search", api_key, {"q": query})
+        if status == 200:
+            return body.get('data', [])
         return []
     except Exception as e:
         print(f"Error searching: {e}")
@@ -111,9 +228,9 @@ def search_images(query, api_key):
 def get_image_by_id(image_id, api_key):
     """Get specific image details"""
     try:
-        response = requests.get(f"{BASE_URL}/api/image/{image_id}", headers={"X-API-Key": api_key})
-        if response.status_code == 200:
-            return response.json().get('data', None)
+        status, body = api_cache.get(f"/api/image/{image_id}", api_key)
+        if status == 200:
+            return body.get('data', None)
         return None
     except Exception as e:
         print(f"Error fetching image: {e}")
@@ -122,9 +239,9 @@ def get_image_by_id(image_id, api_key):
 def extract_pdf_text(pdf_id, api_key):
     """Extract text from PDF"""
     try:
-        response = requests.get(f"{BASE_URL}/api/pdf/{pdf_id}/text", headers={"X-API-Key": api_key})
-        if response.status_code == 200:
-            return response.json().get('data', {}).get('text', '')
+        status, body = api_cache.get(f"/api/pdf/{pdf_id}/text", api_key)
+        if status == 200:
+            return body.get('data', {}).get('text', '')
         return None
     except Exception as e:
         print(f"Error extracting PDF text: {e}")
@@ -132,9 +249,25 @@ def extract_pdf_text(pdf_id, api_key):
 
 def count_items(api_key):
     """Count total images and PDFs"""
-    images = get_all_images(api_key)
-    pdfs = get_all_pdfs(api_key)
-    folders = get_all_folders(api_key)
+    try:
+        status, body = api_cache.get("/api/stats", api_key)
+        if status == 200:
+            stats = body['data']
+            return {
+                'images': stats['images'],
+                'pdfs': stats['pdfs'],
+                'folders': stats['folders'],
+                'total': stats['images'] + stats['pdfs']
+            }
+    except Exception as e:
+        print(f"Error fetching stats: {e}")
+    # Older servers have no stats endpoint; count the full listings instead
+    # Submitted to their own threads: the fan-out pool may be needed by the fetches themselves
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        images = pool.submit(get_all_images, api_key)
+        pdfs = pool.submit(get_all_pdfs, api_key)
+        folders = pool.submit(get_all_folders, api_key)
+        images, pdfs, folders = images.result(), pdfs.result(), folders.result()
     return {
         'images': len(images),
         'pdfs': len(pdfs),
@@ -162,44 +295,105 @@ def filter_by_filename(items, keyword):
             filtered.append(item)
     return filtered
 
-def get_recent_items(items, limit=10):
-    """Get most recent items"""
+def get_recent_items(file_type, api_key, limit=10):
+    """Get the most recent images ('image') or PDFs ('pdf')"""
+    try:
+        status, body = api_cache.get("/api/recent", api_key, {"type": file_type, "limit": limit})
+        if status == 200:
+            return body.get('data', [])
+    except Exception as e:
+        print(f"Error fetching recent items: {e}")
+    # Older servers have no recent endpoint; sort the full listing instead
+    items = get_all_pdfs(api_key) if file_type == 'pdf' else get_all_images(api_key)
     sorted_items = sorted(items, key=lambda x: x.get('uploaded_at', ''), reverse=True)
     return sorted_items[:limit]
 
-def process_message(message, api_key):
-    """Process user message and return appropriate response"""
-    message_lower = message.lower().strip()
-
-    # Greetings
-    if any(word in message_lower for word in ['hello', 'hi', 'hey', 'greetings', 'good morning', 'good afternoon', 'good evening']):
-        return {
-            'type': 'text',
-            'message': """Hello! I'm your Image Assistant. I can help you find images and PDFs. Try asking me:
-• Show all images
-• Find images about [topic]
-• Show PDFs
-• List folders
-• Search for [name]"""
-        }
-
-    # Show all folders
-    if any(phrase in message_lower for phrase in ['show folders', 'list folders', 'all folders', 'show all folders', 'display folders', 'what folders', 'my folders', 'view folders', 'get folders', 'folders list']):
-        folders = get_all_folders(api_key)
-        if folders:
-            folder_list = '\n'.join([f"📁 {f['name']} ({f['file_count']} files)" for f in folders])
-            return {
-                'type': 'text',
-                'message': f"You have {len(folders)} folders:\n\n{folder_list}\n\nTo view a folder's contents, ask 'Show folder [name]'"
-            }
-        return {'type': 'text', 'message': 'No folders found in your collection.'}
-
-    # Show specific folder
-    folder_patterns = [
-        r'show .* folder',
-        r'display .* folder',
-        r'view .* folder',
-        r'open .* folder',
+class PhraseMatcher:
+    """Aho-Corasick automaton: every phrase contained in a text, in one pass over it.
+
+    The cost of a scan depends on the length of the text, not on how many
+    phrases are registered.
+    """
+
+    def __init__(self, phrases):
+        # phrases: iterable of (phrase, label)
+        goto = [{}]
+        outputs = [set()]
+        for phrase, label in phrases:
+            state = 0
+            for char in phrase:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append(set())
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].add(label)
+
+        # Fold the failure links into the transitions so a scan never backtracks
+        fail = [0] * len(goto)
+        self._delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            self._delta[state] = {**self._delta[fail[state]], **goto[state]}
+            for char, child in goto[state].items():
+                fail[child] = self._delta[fail[state]].get(char, 0) if state else 0
+                queue.append(child)
+        self._output = [frozenset(labels) for labels in outputs]
+
+    def labels(self, text):
+        """Labels of every phrase that occurs in *text*"""
+        delta, output = self._delta, self._output
+        found = set()
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+class IntentRouter:
+    """Map a message to its intents, highest priority first.
+
+    Each intent is ``(name, trigger phrases, capture patterns)``, listed in
+    priority order. An intent is a candidate when any of its phrases occurs
+    in the message. Intents with capture patterns must also match one of
+    them; the ``slot`` is the first group of the first pattern, in list
+    order, that matches.
+    """
+
+    def __init__(self, intents):
+        self.intents = []
+        phrases = []
+        for priority, (name, triggers, patterns) in enumerate(intents):
+            compiled = [re.compile(pattern) for pattern in patterns] if patterns else None
+            self.intents.append((name, compiled))
+            phrases.extend((phrase, priority) for phrase in triggers)
+        self.matcher = PhraseMatcher(phrases)
+
+    def candidates(self, message):
+        """Yield ``(intent, slot)`` for each matching intent, highest priority first"""
+        for priority in sorted(self.matcher.labels(message)):
+            name, patterns = self.intents[priority]
+            if patterns is None:
+                yield name, None
+                continue
+            for pattern in patterns:
+                match = pattern.search(message)
+                if match:
+                    yield name, match.group(1)
+                    break
+
+# Intents in priority order: (name, trigger phrases, capture patterns)
+INTENTS = [
+    ('greeting', ['hello', 'hi', 'hey', 'greetings', 'good morning', 'good afternoon', 'good evening'], None),
+    ('list_folders', ['show folders', 'list folders', 'all folders', 'show all folders', 'display folders', 'what folders', 'my folders', 'view folders', 'get folders', 'folders list'], None),
+    ('show_folder', ['folder'], [
+        r'show (.*) folder',
+        r'display (.*) folder',
+        r'view (.*) folder',
+        r'open (.*) folder',
         r'show folder (.*)',
         r'(.*) folder images',
         r'(.*) folder contents',
@@ -211,99 +405,12 @@ def process_message(message, api_key):
         r'(.*) folder files',
         r'see (.*) folder',
         r'browse (.*) folder'
-    ]
-
-    for pattern in folder_patterns:
-        match = re.search(pattern, message_lower)
-        if match:
-            folder_name = match.group(1).strip()
-            folder = get_folder_by_name(folder_name, api_key)
-            if folder:
-                folder_details = get_folder_by_id(folder['id'], api_key)
-                if folder_details:
-                    files = folder_details.get('files', [])
-                    images = [f for f in files if f['file_type'].lower() in ['jpg', 'jpeg', 'png', 'gif', 'webp']]
-                    pdfs = [f for f in files if f['file_type'].lower() == 'pdf']
-
-                    response = {
-                        'type': 'mixed',
-                        'message': f"📁 {folder['name']} contains {len(files)} files:",
-                        'images': [],
-                        'pdfs': []
-                    }
-
-                    if images:
-                        for img in images:
-                            img['folder_name'] = folder['name']
-                        response['images'] = images
-
-                    if pdfs:
-                        for pdf in pdfs:
-                            pdf['folder_name'] = folder['name']
-                        response['pdfs'] = pdfs
-
-                    return response
-
-            return {'type': 'text', 'message': f"Sorry, I couldn't find a folder named '{folder_name}'. Use 'show folders' to see all available folders."}
-
-    # Show all images
-    if any(phrase in message_lower for phrase in ['show all images', 'all images', 'list images', 'display images', 'show images', 'view all images', 'get all images', 'my images', 'show me images', 'display all images']):
-        images = get_all_images(api_key)
-        if images:
-            return {
-                'type': 'images',
-                'message': f"🖼️ I found {len(images)} images in your collection:",
-                'data': images
-            }
-        return {'type': 'text', 'message': 'No images found in your collection.'}
-
-    # Show PDFs
-    if any(phrase in message_lower for phrase in ['show pdfs', 'all pdfs', 'list pdfs', 'display pdfs', 'show documents', 'all documents', 'list documents', 'my pdfs', 'view pdfs', 'get pdfs']):
-        pdfs = get_all_pdfs(api_key)
-        if pdfs:
-            return {
-                'type': 'pdfs',
-                'message': f"📄 I found {len(pdfs)} PDF documents:",
-                'data': pdfs
-            }
-        return {'type': 'text', 'message': 'No PDFs found in your collection.'}
-
-    # Count/Statistics
-    if any(phrase in message_lower for phrase in ['how many', 'count', 'total', 'statistics', 'stats', 'number of', 'how much', 'quantity', 'amount', 'summary']):
-        counts = count_items(api_key)
-        return {
-            'type': 'text',
-            'message': f"""📊 Your Collection Summary:
-📁 Folders: {counts['folders']}
-🖼️ Images: {counts['images']}
-📄 PDFs: {counts['pdfs']}
-📦 Total Files: {counts['total']}"""
-        }
-
-    # Recent items
-    if any(phrase in message_lower for phrase in ['recent', 'latest', 'newest', 'new', 'last', 'most recent']):
-        if 'pdf' in message_lower or 'document' in message_lower:
-            pdfs = get_all_pdfs(api_key)
-            recent = get_recent_items(pdfs, 5)
-            if recent:
-                return {
-                    'type': 'pdfs',
-                    'message': f"📄 Here are your {len(recent)} most recent PDFs:",
-                    'data': recent
-                }
-        else:
-            images = get_all_images(api_key)
-            recent = get_recent_items(images, 5)
-            if recent:
-                return {
-                    'type': 'images',
-                    'message': f"🖼️ Here are your {len(recent)} most recent images:",
-                    'data': recent
-                }
-        return {'type': 'text', 'message': 'No recent items found.'}
-
-    # Search by description
-    desc_patterns = [
+    ]),
+    ('all_images', ['show all images', 'all images', 'list images', 'display images', 'show images', 'view all images', 'get all images', 'my images', 'show me images', 'display all images'], None),
+    ('all_pdfs', ['show pdfs', 'all pdfs', 'list pdfs', 'display pdfs', 'show documents', 'all documents', 'list documents', 'my pdfs', 'view pdfs', 'get pdfs'], None),
+    ('stats', ['how many', 'count', 'total', 'statistics', 'stats', 'number of', 'how much', 'quantity', 'amount', 'summary'], None),
+    ('recent', ['recent', 'latest', 'newest', 'new', 'last', 'most recent'], None),
+    ('description_search', ['desc'], [
         r'with description (.*)',
         r'description (.*)',
         r'described as (.*)',
@@ -314,24 +421,8 @@ def process_message(message, api_key):
         r'description is (.*)',
         r'desc is (.*)',
         r'description has (.*)'
-    ]
-
-    for pattern in desc_patterns:
-        match = re.search(pattern, message_lower)
-        if match:
-            keyword = match.group(1).strip()
-            images = get_all_images(api_key)
-            filtered = filter_by_description(images, keyword)
-            if filtered:
-                return {
-                    'type': 'images',
-                    'message': f"🔍 Found {len(filtered)} images with description containing '{keyword}':",
-                    'data': filtered
-                }
-            return {'type': 'text', 'message': f"No images found with description containing '{keyword}'."}
-
-    # Search by filename
-    filename_patterns = [
+    ]),
+    ('filename_search', ['name', 'called'], [
         r'named (.*)',
         r'filename (.*)',
         r'file called (.*)',
@@ -342,43 +433,161 @@ def process_message(message, api_key):
         r'called (.*)',
         r'file name (.*)',
         r'with filename (.*)'
-    ]
-
-    for pattern in filename_patterns:
-        match = re.search(pattern, message_lower)
-        if match:
-            keyword = match.group(1).strip()
-            images = get_all_images(api_key)
-            filtered = filter_by_filename(images, keyword)
-            if filtered:
-                return {
-                    'type': 'images',
-                    'message': f"🔍 Found {len(filtered)} images with filename containing '{keyword}':",
-                    'data': filtered
-                }
-            return {'type': 'text', 'message': f"No images found with filename containing '{keyword}'."}
-
-    # General search
-    if any(word in message_lower for word in ['find', 'search', 'look for', 'looking for', 'get', 'show me', 'locate', 'discover', 'fetch']):
-        search_terms = message_lower
-        for word in ['find', 'search', 'show me', 'show', 'get', 'look for', 'looking for', 'images about', 'images of', 'pictures of', 'locate', 'discover', 'fetch', 'for']:
-            search_terms = search_terms.replace(word, '').strip()
-
-        if search_terms:
-            results = search_images(search_terms, api_key)
-            if results:
-                return {
-                    'type': 'images',
-                    'message': f"🔍 I found {len(results)} results for '{search_terms}':",
-                    'data': results
-                }
-            return {'type': 'text', 'message': f"Sorry, I couldn't find any images matching '{search_terms}'. Try a different search term!"}
-
-    # Help
-    if any(word in message_lower for word in ['help', 'commands', 'what can you do', 'capabilities', 'options']):
+    ]),
+    ('search', ['find', 'search', 'look for', 'looking for', 'get', 'show me', 'locate', 'discover', 'fetch'], None),
+    ('help', ['help', 'commands', 'what can you do', 'capabilities', 'options'], None),
+    ('thanks', ['thank', 'thanks', 'appreciate'], None),
+    ('goodbye', ['bye', 'goodbye', 'see you'], None),
+]
+
+intent_router = IntentRouter(INTENTS)
+
+def handle_greeting(message, message_lower, slot, api_key):
+    return {
+        'type': 'text',
+        'message': """Hello! I'm your Image Assistant. I can help you find images and PDFs. Try asking me:
+• Show all images
+• Find images about [topic]
+• Show PDFs
+• List folders
+• Search for [name]"""
+    }
+
+def handle_list_folders(message, message_lower, slot, api_key):
+    folders = get_all_folders(api_key)
+    if folders:
+        folder_list = '\n'.join([f"📁 {f['name']} ({f['file_count']} files)" for f in folders])
         return {
             'type': 'text',
-            'message': """Here's what I can do:
+            'message': f"You have {len(folders)} folders:\n\n{folder_list}\n\nTo view a folder's contents, ask 'Show folder [name]'"
+        }
+    return {'type': 'text', 'message': 'No folders found in your collection.'}
+
+def handle_show_folder(message, message_lower, slot, api_key):
+    folder_name = slot.strip()
+    folder = get_folder_by_name(folder_name, api_key)
+    if folder:
+        folder_details = get_folder_by_id(folder['id'], api_key)
+        if folder_details:
+            files = folder_details.get('files', [])
+            images = [f for f in files if f['file_type'].lower() in ['jpg', 'jpeg', 'png', 'gif', 'webp']]
+            pdfs = [f for f in files if f['file_type'].lower() == 'pdf']
+
+            response = {
+                'type': 'mixed',
+                'message': f"📁 {folder['name']} contains {len(files)} files:",
+                'images': [],
+                'pdfs': []
+            }
+
+            if images:
+                for img in images:
+                    img['folder_name'] = folder['name']
+                response['images'] = images
+
+            if pdfs:
+                for pdf in pdfs:
+                    pdf['folder_name'] = folder['name']
+                response['pdfs'] = pdfs
+
+            return response
+
+    return {'type': 'text', 'message': f"Sorry, I couldn't find a folder named '{folder_name}'. Use 'show folders' to see all available folders."}
+
+def handle_all_images(message, message_lower, slot, api_key):
+    images = get_all_images(api_key)
+    if images:
+        return {
+            'type': 'images',
+            'message': f"🖼️ I found {len(images)} images in your collection:",
+            'data': images
+        }
+    return {'type': 'text', 'message': 'No images found in your collection.'}
+
+def handle_all_pdfs(message, message_lower, slot, api_key):
+    pdfs = get_all_pdfs(api_key)
+    if pdfs:
+        return {
+            'type': 'pdfs',
+            'message': f"📄 I found {len(pdfs)} PDF documents:",
+            'data': pdfs
+        }
+    return {'type': 'text', 'message': 'No PDFs found in your collection.'}
+
+def handle_stats(message, message_lower, slot, api_key):
+    counts = count_items(api_key)
+    return {
+        'type': 'text',
+        'message': f"""📊 Your Collection Summary:
+📁 Folders: {counts['folders']}
+🖼️ Images: {counts['images']}
+📄 PDFs: {counts['pdfs']}
+📦 Total Files: {counts['total']}"""
+    }
+
+def handle_recent(message, message_lower, slot, api_key):
+    if 'pdf' in message_lower or 'document' in message_lower:
+        recent = get_recent_items('pdf', api_key, 5)
+        if recent:
+            return {
+                'type': 'pdfs',
+                'message': f"📄 Here are your {len(recent)} most recent PDFs:",
+                'data': recent
+            }
+    else:
+        recent = get_recent_items('image', api_key, 5)
+        if recent:
+            return {
+                'type': 'images',
+                'message': f"🖼️ Here are your {len(recent)} most recent images:",
+                'data': recent
+            }
+    return {'type': 'text', 'message': 'No recent items found.'}
+
+def handle_description_search(message, message_lower, slot, api_key):
+    keyword = slot.strip()
+    images = get_all_images(api_key)
+    filtered = filter_by_description(images, keyword)
+    if filtered:
+        return {
+            'type': 'images',
+            'message': f"🔍 Found {len(filtered)} images with description containing '{keyword}':",
+            'data': filtered
+        }
+    return {'type': 'text', 'message': f"No images found with description containing '{keyword}'."}
+
+def handle_filename_search(message, message_lower, slot, api_key):
+    keyword = slot.strip()
+    images = get_all_images(api_key)
+    filtered = filter_by_filename(images, keyword)
+    if filtered:
+        return {
+            'type': 'images',
+            'message': f"🔍 Found {len(filtered)} images with filename containing '{keyword}':",
+            'data': filtered
+        }
+    return {'type': 'text', 'message': f"No images found with filename containing '{keyword}'."}
+
+def handle_search(message, message_lower, slot, api_key):
+    search_terms = message_lower
+    for word in ['find', 'search', 'show me', 'show', 'get', 'look for', 'looking for', 'images about', 'images of', 'pictures of', 'locate', 'discover', 'fetch', 'for']:
+        search_terms = search_terms.replace(word, '').strip()
+
+    if search_terms:
+        results = search_images(search_terms, api_key)
+        if results:
+            return {
+                'type': 'images',
+                'message': f"🔍 I found {len(results)} results for '{search_terms}':",
+                'data': results
+            }
+        return {'type': 'text', 'message': f"Sorry, I couldn't find any images matching '{search_terms}'. Try a different search term!"}
+    return None
+
+def handle_help(message, message_lower, slot, api_key):
+    return {
+        'type': 'text',
+        'message': """Here's what I can do:
 
 📁 Folders:
 • "Show all folders" - List all folders
@@ -404,21 +613,45 @@ def process_message(message, api_key):
 • "Count" - Show totals
 
 Just ask me naturally and I'll help you find what you need!"""
-        }
+    }
 
-    # Thank you
-    if any(phrase in message_lower for phrase in ['thank', 'thanks', 'appreciate']):
-        return {
-            'type': 'text',
-            'message': "You're welcome! Feel free to ask me anything else!"
-        }
+def handle_thanks(message, message_lower, slot, api_key):
+    return {
+        'type': 'text',
+        'message': "You're welcome! Feel free to ask me anything else!"
+    }
 
-    # Goodbye
-    if any(word in message_lower for word in ['bye', 'goodbye', 'see you']):
-        return {
-            'type': 'text',
-            'message': 'Goodbye! Come back anytime you need help with your images and PDFs!'
-        }
+def handle_goodbye(message, message_lower, slot, api_key):
+    return {
+        'type': 'text',
+        'message': 'Goodbye! Come back anytime you need help with your images and PDFs!'
+    }
+
+INTENT_HANDLERS = {
+    'greeting': handle_greeting,
+    'list_folders': handle_list_folders,
+    'show_folder': handle_show_folder,
+    'all_images': handle_all_images,
+    'all_pdfs': handle_all_pdfs,
+    'stats': handle_stats,
+    'recent': handle_recent,
+    'description_search': handle_description_search,
+    'filename_search': handle_filename_search,
+    'search': handle_search,
+    'help': handle_help,
+    'thanks': handle_thanks,
+    'goodbye': handle_goodbye,
+}
+
+def process_message(message, api_key):
+    """Process user message and return appropriate response"""
+    message_lower = message.lower().strip()
+
+    # Handlers return None to pass the message on to the next matching intent
+    for intent, slot in intent_router.candidates(message_lower):
+        response = INTENT_HANDLERS[intent](message, message_lower, slot, api_key)
+        if response:
+            return response
 
     # Default: try to search with the entire message
     results = search_images(message, api_key)
@@ -484,7 +717,7 @@ def verify_api_key():
     
     try:
         # Test the API key by fetching folders
-        response = requests.get(f"{BASE_URL}/api/folders", headers={"X-API-Key": api_key})
+        response = api_get("/api/folders", api_key)
         if response.status_code == 200:
             return jsonify({'valid': True, 'message': 'API key is valid'})
         else:
@@ -1,5 +1,5 @@
 import os
-from app import app, db
+from app import app, db, run_migrations, ensure_search_index
 
 def init_database():
     """Initialize the database and create all tables"""
@@ -8,6 +8,14 @@ def init_database():
         print("Creating database tables...")
         db.create_all()
         print("✓ Database tables created successfully!")
+
+        # Bring databases created by older versions up to date
+        run_migrations()
+        print("✓ Migrations applied!")
+
+        # Create and backfill the full-text search index
+        ensure_search_index()
+        print("✓ Search index ready!")
         
         # Create upload directory
         upload_dir = app.config['UPLOAD_FOLDER']
@@ -0,0 +1,137 @@
+"""Fixtures running each test against embedded SQLite and a throwaway PostgreSQL.
+
+PostgreSQL comes from TEST_POSTGRESQL_URL if set, otherwise from a temporary
+server started with testing.postgresql (or pgserver, which bundles its own
+binaries). PostgreSQL tests are skipped when none of these is available.
+"""
+import importlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+@pytest.fixture(scope='session')
+def postgresql_url():
+    url = os.environ.get('TEST_POSTGRESQL_URL')
+    if url:
+        yield url
+        return
+    try:
+        import testing.postgresql
+        server = testing.postgresql.Postgresql()
+    except (ImportError, RuntimeError):
+        server = None
+    if server is not None:
+        yield server.url()
+        server.stop()
+        return
+    try:
+        import pgserver
+    except ImportError:
+        pytest.skip('No PostgreSQL available: set TEST_POSTGRESQL_URL or install testing.postgresql')
+    data_dir = tempfile.mkdtemp()
+    server = pgserver.get_server(data_dir, cleanup_mode='stop')
+    yield server.get_uri()
+    server.cleanup()
+    shutil.rmtree(data_dir, ignore_errors=True)
+
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def app_module(request, tmp_path, monkeypatch):
+    """A freshly imported app module on an empty database"""
+    if request.param == 'postgresql':
+        url = make_url(request.getfixturevalue('postgresql_url')).set(drivername='postgresql+psycopg2')
+        url = url.render_as_string(hide_password=False)
+        engine = create_engine(url)
+        with engine.begin() as connection:
+            connection.execute(text('DROP SCHEMA public CASCADE'))
+            connection.execute(text('CREATE SCHEMA public'))
+        engine.dispose()
+    else:
+        url = 'sqlite://'
+    monkeypatch.setenv('DATABASE_URL', url)
+    monkeypatch.setenv('PROCESSING_RECOVERY_INTERVAL', '0')  # Tests run jobs themselves
+    monkeypatch.chdir(tmp_path)
+
+    sys.modules.pop('app', None)
+    module = importlib.import_module('app')
+    module.app.config.update(TESTING=True, UPLOAD_FOLDER=str(tmp_path / 'uploads'))
+    # Run processing jobs when the test asks for them rather than on a worker thread
+    dispatched = []
+    monkeypatch.setattr(module, 'dispatch_jobs', lambda jobs: dispatched.extend(job.id for job in jobs))
+    module.dispatched_jobs = dispatched
+    with module.app.app_context():
+        module.setup_database()
+    yield module
+    with module.app.app_context():
+        module.db.session.remove()
+        module.db.engine.dispose()
+    sys.modules.pop('app', None)
+
+
+@pytest.fixture
+def user(app_module):
+    """``(api_key, folder_id)`` for a user with one folder"""
+    with app_module.app.app_context():
+        account = app_module.User(username='test', email='test@example.com', api_key='test-key', password_hash='x')
+        app_module.db.session.add(account)
+        app_module.db.session.flush()
+        folder = app_module.Folder(user_id=account.id, name='test')
+        app_module.db.session.add(folder)
+        app_module.db.session.commit()
+        return account.api_key, folder.id
+
+
+def upload(app_module, api_key, folder_id, files, description=''):
+    """Upload ``{filename: bytes}`` through the batch endpoint and run the jobs it queued"""
+    response = app_module.app.test_client().post(
+        f'/api/folder/{folder_id}/upload/batch',
+        headers={'X-API-Key': api_key},
+        data={'files': [(io.BytesIO(data), name) for name, data in files.items()], 'description': description},
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 200, response.get_json()
+    while app_module.dispatched_jobs:
+        app_module.run_processing_job(app_module.dispatched_jobs.pop(0))
+    return [result['id'] for result in response.get_json()['data']['results']]
+
+
+def png_bytes(width=8, height=8, color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def pdf_bytes(*pages):
+    """A minimal PDF with one line of text per page"""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for page in pages:
+        stream = f'BT /F1 12 Tf 20 50 Td ({page}) Tj ET'
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 300 100] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f'{number} 0 obj\n{body}\nendobj\n'.encode())
+    xref = out.tell()
+    out.write(f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode())
+    for offset in offsets:
+        out.write(f'{offset:010d} 00000 n \n'.encode())
+    out.write(f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode())
+    return out.getvalue()
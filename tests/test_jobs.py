@@ -0,0 +1,38 @@
+import threading
+from datetime import datetime, timedelta
+
+from conftest import pdf_bytes, upload
+
+
+def test_resume_requeues_only_jobs_past_their_lease(app_module, user, monkeypatch):
+    api_key, folder_id = user
+    upload(app_module, api_key, folder_id, {'a.pdf': pdf_bytes('a'), 'b.pdf': pdf_bytes('b'), 'c.pdf': pdf_bytes('c')})
+    lease = timedelta(seconds=app_module.app.config['PROCESSING_JOB_LEASE'])
+    with app_module.app.app_context():
+        session = app_module.db.session
+        abandoned, live, queued = app_module.ProcessingJob.query.order_by(app_module.ProcessingJob.id).all()
+        abandoned.status, abandoned.started_at = 'running', datetime.utcnow() - lease - timedelta(minutes=1)
+        live.status, live.started_at = 'running', datetime.utcnow()
+        queued.status = 'queued'
+        session.commit()
+        ids = abandoned.id, live.id, queued.id
+
+    submitted = []
+    monkeypatch.setattr(app_module, 'submit_processing_job', submitted.append)
+    app_module.resume_pending_jobs()
+
+    assert sorted(submitted) == [ids[0], ids[2]]
+    with app_module.app.app_context():
+        assert app_module.db.session.get(app_module.ProcessingJob, ids[1]).status == 'running'
+
+
+def test_job_recovery_starts_once_per_process(app_module, monkeypatch):
+    sweeps = []
+    swept = threading.Event()
+    monkeypatch.setattr(app_module, 'recover_jobs_forever', lambda interval: sweeps.append(interval) or swept.set())
+    monkeypatch.setitem(app_module.app.config, 'PROCESSING_RECOVERY_INTERVAL', 3600)
+
+    app_module.start_job_recovery()
+    app_module.start_job_recovery()
+    assert swept.wait(5)
+    assert sweeps == [3600]
@@ -0,0 +1,67 @@
+import io
+
+from PIL import Image
+
+from conftest import pdf_bytes, png_bytes, upload
+
+
+def gif_bytes(color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), color).save(buffer, 'GIF')
+    return buffer.getvalue()
+
+
+def list_pages(app_module, api_key, path, **params):
+    """Every page of a listing, following next_cursor"""
+    client = app_module.app.test_client()
+    pages = []
+    while True:
+        response = client.get(path, headers={'X-API-Key': api_key}, query_string=params)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        pages.append([item['id'] for item in body['data']])
+        if not body['pagination']['next_cursor']:
+            return pages
+        params['cursor'] = body['pagination']['next_cursor']
+
+
+def upload_mixed(app_module, api_key, folder_id):
+    """Images of two types interleaved with a PDF, one upload at a time"""
+    files = [('a.png', png_bytes()), ('b.gif', gif_bytes()), ('c.pdf', pdf_bytes('c')),
+             ('d.png', png_bytes(color='blue')), ('e.gif', gif_bytes('blue')), ('f.png', png_bytes(color='green'))]
+    return {name: upload(app_module, api_key, folder_id, {name: data})[0] for name, data in files}
+
+
+def test_image_listings_page_across_types(app_module, user):
+    api_key, folder_id = user
+    ids = upload_mixed(app_module, api_key, folder_id)
+    images = [ids[name] for name in ('a.png', 'b.gif', 'd.png', 'e.gif', 'f.png')]
+
+    for path in (f'/api/folder/{folder_id}/images', '/api/images'):
+        assert list_pages(app_module, api_key, path, limit=2) == [images[0:2], images[2:4], images[4:]]
+        assert list_pages(app_module, api_key, path, limit=2, sort='-uploaded_at') == [
+            images[:2:-1], images[2:0:-1], images[:1]
+        ]
+        assert sum(list_pages(app_module, api_key, path, limit=2, sort='name'), []) == images
+    assert list_pages(app_module, api_key, '/api/pdfs') == [[ids['c.pdf']]]
+
+
+def test_image_listing_reads_each_type_from_the_index(app_module, user):
+    api_key, folder_id = user
+    upload_mixed(app_module, api_key, folder_id)
+    with app_module.app.app_context():
+        engine = app_module.db.engine
+        if engine.dialect.name != 'sqlite':
+            return
+        statements = []
+        app_module.event.listen(engine, 'before_cursor_execute',
+                                lambda conn, cursor, sql, params, context, many: statements.append((sql, params)))
+        response = app_module.app.test_client().get(f'/api/folder/{folder_id}/images', headers={'X-API-Key': api_key})
+        assert response.status_code == 200
+        sql, params = next((sql, params) for sql, params in statements if 'ORDER BY file.uploaded_at' in sql)
+        plan = [row[-1] for row in app_module.db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+    # One bounded index range per image type, rather than every image in the folder sorted for each page
+    type_ranges = [line for line in plan if 'ix_file_folder_type_uploaded (folder_id=? AND file_type=?)' in line]
+    assert len(type_ranges) == len(app_module.IMAGE_TYPES)
+    assert not [line for line in plan if line.startswith('SCAN file') or line.endswith('(folder_id=?)')]
@@ -0,0 +1,72 @@
+from sqlalchemy import text
+
+from conftest import png_bytes, upload
+
+
+def test_all_migrations_recorded(app_module):
+    with app_module.app.app_context():
+        applied = [row.version for row in app_module.SchemaMigration.query.order_by(app_module.SchemaMigration.version)]
+        assert applied == sorted(version for version, _, _ in app_module.MIGRATIONS)
+        app_module.run_migrations()  # Re-running is a no-op
+        assert app_module.SchemaMigration.query.count() == len(applied)
+
+
+def test_folder_counters_backfilled_on_existing_database(app_module, user, monkeypatch):
+    api_key, folder_id = user
+    upload(app_module, api_key, folder_id, {'a.png': png_bytes(), 'b.png': png_bytes(color='blue')})
+    monkeypatch.setattr(app_module, 'MIGRATION_BATCH_SIZE', 1)
+
+    with app_module.app.app_context():
+        session = app_module.db.session
+        other = app_module.Folder(user_id=1, name='other')
+        session.add(other)
+        session.commit()
+        other_id = other.id
+    upload(app_module, api_key, other_id, {'c.png': png_bytes(color='green')})
+
+    with app_module.app.app_context():
+        session = app_module.db.session
+        # Roll the database back to before the counters existed
+        for column in ('file_count', 'image_count', 'pdf_count', 'total_bytes'):
+            session.execute(text(f'ALTER TABLE folder DROP COLUMN {column}'))
+        session.execute(text('DELETE FROM schema_migration WHERE version = 5'))
+        session.commit()
+
+        app_module.run_migrations()
+        stats = app_module.collection_stats(1)
+        assert (stats['files'], stats['images'], stats['pdfs']) == (3, 3, 0)
+        assert {folder['id']: folder['files'] for folder in stats['by_folder']} == {folder_id: 2, other_id: 1}
+        assert stats['total_bytes'] == sum(f.size_bytes for f in app_module.File.query)
+
+
+def test_counters_follow_file_changes(app_module, user):
+    api_key, folder_id = user
+    upload(app_module, api_key, folder_id, {'a.png': png_bytes()})
+
+    with app_module.app.app_context():
+        session = app_module.db.session
+        other = app_module.Folder(user_id=1, name='other')
+        session.add(other)
+        session.commit()
+        file = app_module.File.query.one()
+        file.folder_id = other.id
+        session.commit()
+        by_folder = {folder['id']: folder['files'] for folder in app_module.collection_stats(1)['by_folder']}
+        assert by_folder == {folder_id: 0, other.id: 1}
+
+
+def test_file_owner_backfilled_on_existing_database(app_module, user, monkeypatch):
+    api_key, folder_id = user
+    file_ids = upload(app_module, api_key, folder_id, {'a.png': png_bytes(), 'b.png': png_bytes(color='blue')})
+    monkeypatch.setattr(app_module, 'MIGRATION_BATCH_SIZE', 1)
+
+    with app_module.app.app_context():
+        session = app_module.db.session
+        session.execute(text('DROP INDEX ix_file_user_type_uploaded'))
+        session.execute(text('UPDATE file SET user_id = NULL'))
+        session.execute(text('DELETE FROM schema_migration WHERE version = 6'))
+        session.commit()
+
+        app_module.run_migrations()
+        assert [session.get(app_module.File, file_id).user_id for file_id in file_ids] == [1, 1]
+        assert [file.id for file in app_module.recent_files(1, ['png'], 10, ['id'])] == file_ids[::-1]
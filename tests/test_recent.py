@@ -0,0 +1,45 @@
+from conftest import pdf_bytes, png_bytes, upload
+
+
+def recent(app_module, api_key, **params):
+    response = app_module.app.test_client().get('/api/recent', headers={'X-API-Key': api_key}, query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return [item['id'] for item in response.get_json()['data']]
+
+
+def test_recent_files_newest_first_across_types(app_module, user):
+    api_key, folder_id = user
+    ids = []
+    for name, data in [('a.png', png_bytes()), ('b.pdf', pdf_bytes('b')), ('c.png', png_bytes(color='blue')),
+                       ('d.pdf', pdf_bytes('d'))]:
+        ids += upload(app_module, api_key, folder_id, {name: data})
+
+    assert recent(app_module, api_key, limit=3) == ids[:0:-1]
+    assert recent(app_module, api_key, type='image') == [ids[2], ids[0]]
+    assert recent(app_module, api_key, type='pdf', limit=1) == [ids[3]]
+
+
+def test_recent_files_read_only_the_users_own_files(app_module, user):
+    api_key, folder_id = user
+    own, = upload(app_module, api_key, folder_id, {'mine.png': png_bytes()})
+    with app_module.app.app_context():
+        session = app_module.db.session
+        other = app_module.User(username='other', email='other@example.com', api_key='other-key', password_hash='x')
+        session.add(other)
+        session.flush()
+        other_folder = app_module.Folder(user_id=other.id, name='other')
+        session.add(other_folder)
+        session.commit()
+        other_folder_id = other_folder.id
+    upload(app_module, 'other-key', other_folder_id, {'theirs.png': png_bytes(color='blue')})
+
+    assert recent(app_module, api_key) == [own]
+    with app_module.app.app_context():
+        session = app_module.db.session
+        if session.get_bind().dialect.name == 'sqlite':
+            query = session.query(app_module.File.id).filter(
+                app_module.File.user_id == 1, app_module.File.file_type == 'png'
+            ).order_by(app_module.File.uploaded_at.desc())
+            sql = str(query.statement.compile(session.get_bind(), compile_kwargs={'literal_binds': True}))
+            plan = ' '.join(row[-1] for row in session.execute(app_module.text(f'EXPLAIN QUERY PLAN {sql}')))
+            assert 'ix_file_user_type_uploaded' in plan
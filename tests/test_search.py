@@ -0,0 +1,81 @@
+import io
+import json
+
+from conftest import pdf_bytes, png_bytes, upload
+
+
+def search_pages(app_module, api_key, query, limit):
+    """Every page of /api/search results, following next_cursor"""
+    client = app_module.app.test_client()
+    pages = []
+    params = {'q': query, 'limit': limit}
+    while True:
+        response = client.get('/api/search', headers={'X-API-Key': api_key}, query_string=params)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        pages.append([item['id'] for item in body['data']])
+        if not body['pagination']['next_cursor']:
+            return pages
+        params['cursor'] = body['pagination']['next_cursor']
+
+
+def test_ranked_search_pages_with_cursor(app_module, user):
+    api_key, folder_id = user
+    ids = []
+    for n, color in enumerate(['red', 'green', 'blue', 'white', 'black']):
+        ids += upload(app_module, api_key, folder_id, {f'sunset{n}.png': png_bytes(color=color)})
+    ids += upload(app_module, api_key, folder_id, {'beach.png': png_bytes(color='yellow')}, description='sunset at sea')
+    upload(app_module, api_key, folder_id, {'forest.png': png_bytes(color='gray')}, description='trees')
+
+    pages = search_pages(app_module, api_key, 'sunset', limit=2)
+    assert [len(page) for page in pages] == [2, 2, 2]
+    found = [file_id for page in pages for file_id in page]
+    assert sorted(found) == sorted(ids)
+    # A filename match outranks a match in the description only
+    assert found[-1] == ids[-1]
+
+
+def test_search_matches_pdf_text(app_module, user):
+    api_key, folder_id = user
+    file_id, = upload(app_module, api_key, folder_id, {'report.pdf': pdf_bytes('quarterly revenue', 'appendix')})
+    upload(app_module, api_key, folder_id, {'other.pdf': pdf_bytes('unrelated')})
+
+    assert search_pages(app_module, api_key, 'revenue', limit=10) == [[file_id]]
+
+
+def test_search_only_returns_own_files(app_module, user):
+    api_key, folder_id = user
+    upload(app_module, api_key, folder_id, {'sunset.png': png_bytes()})
+    with app_module.app.app_context():
+        other = app_module.User(username='other', email='other@example.com', api_key='other-key', password_hash='x')
+        app_module.db.session.add(other)
+        app_module.db.session.commit()
+
+    assert search_pages(app_module, 'other-key', 'sunset', limit=10) == [[]]
+
+
+def test_indexing_pdf_text_invalidates_cached_search(app_module, user):
+    api_key, folder_id = user
+    client = app_module.app.test_client()
+    headers = {'X-API-Key': api_key}
+    response = client.post(
+        f'/api/folder/{folder_id}/upload/batch', headers=headers,
+        data={'files': [(io.BytesIO(pdf_bytes('quarterly revenue')), 'report.pdf')]},
+        content_type='multipart/form-data'
+    )
+    file_id = response.get_json()['data']['results'][0]['id']
+    app_module.dispatched_jobs.clear()  # Leave the text unindexed, like a file from before extraction jobs
+    with app_module.app.app_context():
+        # Its page count is already known, so indexing the text changes no File row
+        file = app_module.db.session.get(app_module.File, file_id)
+        file.metadata_json = json.dumps({'page_count': 1})
+        app_module.db.session.commit()
+
+    before = client.get('/api/search', headers=headers, query_string={'q': 'revenue'})
+    assert before.get_json()['data'] == []
+
+    assert client.get(f'/api/pdf/{file_id}/text', headers=headers).status_code == 200
+    after = client.get('/api/search', headers={**headers, 'If-None-Match': before.headers['ETag']},
+                       query_string={'q': 'revenue'})
+    assert after.status_code == 200
+    assert [item['id'] for item in after.get_json()['data']] == [file_id]
@@ -0,0 +1,99 @@
+import fcntl
+import os
+import threading
+
+from conftest import pdf_bytes, png_bytes, upload
+
+
+def test_duplicate_uploads_share_one_blob(app_module, user):
+    api_key, folder_id = user
+    first, second = upload(app_module, api_key, folder_id, {'a.png': png_bytes(), 'b.png': png_bytes()})
+
+    with app_module.app.app_context():
+        blob = app_module.Blob.query.one()
+        assert blob.ref_count == 2
+        path = os.path.join(app_module.app.config['UPLOAD_FOLDER'], blob.file_path)
+        assert os.path.exists(path)
+
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+    assert client.post(f'/file/{first}/delete').status_code == 200
+    with app_module.app.app_context():
+        assert app_module.Blob.query.one().ref_count == 1
+    assert os.path.exists(path)
+
+    assert client.post(f'/file/{second}/delete').status_code == 200
+    with app_module.app.app_context():
+        assert app_module.Blob.query.count() == 0
+    assert not os.path.exists(path)
+
+
+def test_blob_upsert_counts_references(app_module, user):
+    with app_module.app.app_context():
+        for _ in range(3):
+            app_module.db.session.execute(app_module.upsert(app_module.Blob).values(
+                digest='ab' * 32, size_bytes=1, content_type='image/png', file_path='blobs/ab/x.png', ref_count=1
+            ).on_conflict_do_update(
+                index_elements=['digest'],
+                set_={'ref_count': app_module.Blob.ref_count + 1}
+            ))
+        app_module.db.session.commit()
+        assert app_module.Blob.query.one().ref_count == 3
+
+
+def test_pdf_pages_are_stored_once(app_module, user):
+    api_key, folder_id = user
+    file_id, = upload(app_module, api_key, folder_id, {'doc.pdf': pdf_bytes('first page', 'second page', 'third page')})
+
+    with app_module.app.app_context():
+        file = app_module.db.session.get(app_module.File, file_id)
+        assert app_module.PdfPage.query.count() == 3
+        # Reading again, or inserting the same pages again, leaves a single copy of each page
+        assert [number for number, _ in app_module.iter_pdf_pages(file)] == [1, 2, 3]
+        app_module.db.session.execute(
+            app_module.upsert(app_module.PdfPage).on_conflict_do_nothing(),
+            [{'sha256': file.sha256, 'page_number': 1, 'text': 'other'}]
+        )
+        app_module.db.session.commit()
+        pages = app_module.PdfPage.query.order_by(app_module.PdfPage.page_number).all()
+        assert [page.text.strip() for page in pages] == ['first page', 'second page', 'third page']
+        assert file.page_count == 3
+
+
+def test_deleting_folder_releases_its_blobs(app_module, user):
+    api_key, folder_id = user
+    upload(app_module, api_key, folder_id, {'a.png': png_bytes(), 'b.png': png_bytes(), 'doc.pdf': pdf_bytes('text')})
+    with app_module.app.app_context():
+        paths = [os.path.join(app_module.app.config['UPLOAD_FOLDER'], blob.file_path) for blob in app_module.Blob.query]
+
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+    assert client.post(f'/folder/{folder_id}/delete').status_code == 302
+    with app_module.app.app_context():
+        assert app_module.Blob.query.count() == 0
+        assert app_module.PdfPage.query.count() == 0
+    assert not any(os.path.exists(path) for path in paths)
+
+
+def test_blob_lock_excludes_other_processes(app_module, user):
+    digest = 'cd' * 32
+    acquired = threading.Event()
+
+    def lock_blob():
+        with app_module.app.app_context(), app_module.blob_lock(digest):
+            acquired.set()
+
+    with app_module.app.app_context(), app_module.blob_lock(digest):
+        stripe = int(digest[:8], 16) % len(app_module.BLOB_LOCKS)
+        lock_path = os.path.join(app_module.app.config['UPLOAD_FOLDER'], 'locks', f'blob-{stripe}.lock')
+    # Another process holding the lock file, as an flock on a separate open file
+    with open(lock_path) as other_process:
+        fcntl.flock(other_process, fcntl.LOCK_EX)
+        waiter = threading.Thread(target=lock_blob)
+        waiter.start()
+        assert not acquired.wait(0.2)
+        fcntl.flock(other_process, fcntl.LOCK_UN)
+    waiter.join(5)
+    assert acquired.is_set()
@@ -0,0 +1,52 @@
+import io
+import os
+
+from conftest import png_bytes
+
+
+def temp_files(app_module):
+    """Ingested uploads waiting in uploads/tmp"""
+    folder = os.path.join(app_module.app.config['UPLOAD_FOLDER'], 'tmp')
+    return [name for name in os.listdir(folder) if os.path.isfile(os.path.join(folder, name))]
+
+
+def test_upload_session_rejects_name_without_extension_after_sanitizing(app_module, user):
+    api_key, folder_id = user
+    response = app_module.app.test_client().post(
+        f'/api/folder/{folder_id}/uploads', headers={'X-API-Key': api_key}, json={'filename': 'фото.png', 'size': 10}
+    )
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Invalid file type'
+
+
+def test_completing_upload_with_invalid_name_cleans_up(app_module, user):
+    api_key, folder_id = user
+    client = app_module.app.test_client()
+    headers = {'X-API-Key': api_key}
+    data = png_bytes()
+    response = client.post(f'/api/folder/{folder_id}/uploads', headers=headers, json={'filename': 'a.png', 'size': len(data)})
+    upload_id = response.get_json()['data']['upload_id']
+    # A session recorded before names were validated after sanitizing
+    with app_module.app.app_context():
+        app_module.db.session.get(app_module.UploadSession, upload_id).filename = 'png'
+        app_module.db.session.commit()
+
+    assert client.put(f'/api/upload/{upload_id}/chunk/0', headers=headers, data=data).status_code == 200
+    response = client.post(f'/api/upload/{upload_id}/complete', headers=headers)
+    assert response.status_code == 400
+    assert temp_files(app_module) == []
+    assert client.get(f'/api/upload/{upload_id}', headers=headers).status_code == 404
+
+
+def test_batch_rejects_name_without_extension_after_sanitizing(app_module, user):
+    api_key, folder_id = user
+    response = app_module.app.test_client().post(
+        f'/api/folder/{folder_id}/upload/batch', headers={'X-API-Key': api_key},
+        data={'files': [(io.BytesIO(png_bytes()), 'фото.png'), (io.BytesIO(png_bytes(color='blue')), 'ok.png')]},
+        content_type='multipart/form-data'
+    )
+    results = response.get_json()['data']['results']
+    assert [(result['status'], result.get('message')) for result in results] == [
+        ('error', 'Invalid file type'), ('success', None)
+    ]
+    assert temp_files(app_module) == []